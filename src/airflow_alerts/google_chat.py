@@ -1,8 +1,12 @@
+import functools
 import json
+import time
 from datetime import datetime
 from datetime import time as dt_time
 from datetime import timedelta
-from enum import Enum
+from string import Template
+from types import MappingProxyType
+from urllib.parse import quote
 
 from airflow.hooks.base import BaseHook
 
@@ -16,110 +20,63 @@ from .utils import (
     _validate_url,
 )
 
+# orjson serializes nested dicts several times faster than stdlib json;
+# fall back to stdlib when it is not installed. Both paths produce bytes,
+# which redis-py accepts as mapping keys.
+try:
+    import orjson
 
-class STATUS_COLORS(Enum):
-    """Enum for Google Chat message colors."""
+    _dumps = orjson.dumps
+except ImportError:
 
-    success = {"red": 0.8, "green": 1, "blue": 0.8}
-    failure = {"red": 1, "green": 0.8, "blue": 0.8}
-    default = {"red": 0.95, "green": 0.95, "blue": 0.95}
-    retry = {"red": 1, "green": 0.9, "blue": 0.7}
-    skipped = {"red": 0.9, "green": 0.8, "blue": 1}
-    sla_miss = {"red": 1, "green": 0.85, "blue": 0.85}
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 
-def _construct_webhook_url(connection_id: str, run_id: str = ""):
-    """
-    Constructs the webhook URL for the specified connection ID.
-    Args:
-        connection_id (str): The connection ID.
-        run_id (str): The optional thread reference. TODO fix this
-    Returns:
-        str: The constructed URL.
-    """
-    gchat_connection = BaseHook.get_connection(connection_id)
-    # Reference for Google Chat API:
-    # https://developers.google.com/workspace/chat/api/reference/rest/v1/spaces.messages/create
-    # MessageReplyOption details:
-    # https://developers.google.com/workspace/chat/api/reference/rest/v1/spaces.messages/create#MessageReplyOption
-    thread_ref = (
-        f"&thread_key={run_id}&messageReplyOption=REPLY_MESSAGE_FALLBACK_TO_NEW_THREAD"
-    )
-    full_url = f"{gchat_connection.password}{thread_ref}"
-    return full_url
-
-
-def _send_message(dag_id, run_id, connection_id, message_body):
-    run_id = _build_task_run_id(dag_id, run_id)
-    full_url = _ensure_https(_construct_webhook_url(connection_id, run_id))
-    if not _validate_url(full_url):
-        print(f"Invalid URL: {full_url}")
-        return
-    print("Sending message to Google Chat")
-    return _send_post_request(message_body, full_url)
+# Google Chat message colors. A read-only mapping instead of an Enum: a plain
+# dict lookup replaces the descriptor hops of `STATUS_COLORS.<member>.value`.
+STATUS_COLORS = MappingProxyType(
+    {
+        "success": {"red": 0.8, "green": 1, "blue": 0.8},
+        "failure": {"red": 1, "green": 0.8, "blue": 0.8},
+        "default": {"red": 0.95, "green": 0.95, "blue": 0.95},
+        "retry": {"red": 1, "green": 0.9, "blue": 0.7},
+        "skipped": {"red": 0.9, "green": 0.8, "blue": 1},
+        "sla_miss": {"red": 1, "green": 0.85, "blue": 0.85},
+    }
+)
 
 
-def basic_alert(
-    connection_id: str, message_body: dict, redis_conn_id: str = None, delay: dt_time = None
-):
+def _json_escape(value) -> str:
     """
-    Sends a basic alert to Google Chat.
-    Useful to send small informative messages in working hours to stakeholders.
+    Escapes a value for splicing into a pre-serialized JSON template.
     Args:
-        connection_id (str): The connection ID.
-        message_body (str): The message body.
-        redis_conn_id (str): The Redis connection ID. If None, the alert is sent immediately.
-        delay (dt_time): The time to delay the alert. If None, the alert is sent immediately.
+        value: The value to escape. Stringified if not already a string.
+    Returns:
+        str: The JSON-escaped string, without the surrounding quotes.
     """
+    return json.dumps(value if isinstance(value, str) else str(value))[1:-1]
 
-    def basic_alert_inner(context):
-        dag_id, run_id = _get_dag_run_identifiers(context)
-        if delay and redis_conn_id:
-            redis_conn = _get_redis_client(redis_conn_id)
-            now = datetime.now()
-            target = now.replace(
-                hour=delay.hour, minute=delay.minute, second=delay.second, microsecond=0
-            )
-            if target <= now:
-                target += timedelta(days=1)
-            # Prepare alert data
-            alert_data = {
-                "dag_id": dag_id,
-                "run_id": run_id,
-                "connection_id": connection_id,
-                "message_body": message_body,
-            }
-            # Store in Redis sorted set with target timestamp as score
-            redis_conn.zadd(
-                "scheduled_alerts", {json.dumps(alert_data): target.timestamp()}
-            )
-            print(f"Alert scheduled for {target.strftime('%Y-%m-%d %H:%M:%S')}")
-        else:
-            return _send_message(dag_id, run_id, connection_id, message_body)
-
-    return basic_alert_inner
-
-
-def task_success_alert(connection_id: str, redis_conn_id: str = None, delay: dt_time = None):
-    """
-    Sends a task success alert to Google Chat.
-    Args:
-        connection_id (str): The connection ID.
-    """
 
-    def task_success_alert_inner(context):
-        task_instance = context.get("task_instance")
-        task_log_url = _build_task_log_url(task_instance)
-        # For more details on the message format, refer to the Google Chat API documentation:
-        # https://developers.google.com/chat/api/guides/message-formats/cards
-        # https://developers.google.com/workspace/chat/api/reference/rest/v1/cards
-        message_body = {
+# The task cards are almost entirely static, so the skeleton is serialized to
+# JSON exactly once at import time; per-status templates fill in title and
+# color below, and per-alert only the dynamic leaves are substituted, which
+# also lets us skip requests' own json serialization on every send.
+# string.Template is used instead of str.format because JSON is full of braces.
+# The "$color" value is unquoted after serialization so the substituted color
+# dict lands as raw JSON rather than a string.
+# For more details on the message format, refer to the Google Chat API documentation:
+# https://developers.google.com/chat/api/guides/message-formats/cards
+# https://developers.google.com/workspace/chat/api/reference/rest/v1/cards
+_CARD_SKELETON = Template(
+    json.dumps(
+        {
             "cardsV2": [
                 {
                     "cardId": "airflow-task-success",
                     "card": {
                         "header": {
-                            "title": "✅ Task completed successfully!",
+                            "title": "$title",
                         },
                         "sections": [
                             {
@@ -127,40 +84,38 @@ def task_success_alert(connection_id: str, redis_conn_id: str = None, delay: dt_
                                     {
                                         "decoratedText": {
                                             "topLabel": "Task Name",
-                                            "text": f"<b>{task_instance.task.task_display_name}</b>",
+                                            "text": "<b>$task_name</b>",
                                         }
                                     },
                                     {
                                         "decoratedText": {
                                             "topLabel": "Task Description",
-                                            "text": task_instance.task.doc_md,
+                                            "text": "$doc_md",
                                             "wrapText": True,
                                         }
                                     },
                                     {
                                         "decoratedText": {
                                             "topLabel": "DAG ID",
-                                            "text": str(task_instance.dag_id),
+                                            "text": "$dag_id",
                                         }
                                     },
                                     {
                                         "decoratedText": {
                                             "topLabel": "Hostname",
-                                            "text": str(task_instance.hostname),
+                                            "text": "$hostname",
                                         }
                                     },
                                     {
                                         "decoratedText": {
                                             "topLabel": "Execution Date",
-                                            "text": task_instance.start_date.strftime(
-                                                "%Y-%m-%d %H:%M:%S"
-                                            ),
+                                            "text": "$exec_date",
                                         }
                                     },
                                     {
                                         "decoratedText": {
                                             "topLabel": "Execution number / Max executions",
-                                            "text": f"{task_instance.try_number} / {task_instance.max_tries + 1}",
+                                            "text": "$try_n / $max_tries",
                                         }
                                     },
                                     {
@@ -168,11 +123,9 @@ def task_success_alert(connection_id: str, redis_conn_id: str = None, delay: dt_
                                             "buttons": [
                                                 {
                                                     "text": "<b>View Logs</b>",
-                                                    "color": STATUS_COLORS.success.value,
+                                                    "color": "$color",
                                                     "onClick": {
-                                                        "openLink": {
-                                                            "url": task_log_url
-                                                        }
+                                                        "openLink": {"url": "$log_url"}
                                                     },
                                                 }
                                             ]
@@ -185,106 +138,239 @@ def task_success_alert(connection_id: str, redis_conn_id: str = None, delay: dt_
                 }
             ]
         }
-        return basic_alert(
-            connection_id=connection_id,
-            message_body=message_body,
-            redis_conn_id=redis_conn_id,
-            delay=delay
-        )(context)
+    ).replace('"$color"', "$color")
+)
 
-    return task_success_alert_inner
 
+def _make_card_template(title: str, color: dict) -> Template:
+    """
+    Pre-seats the shared card skeleton for one status.
+    Args:
+        title (str): The card header title.
+        color (dict): The button color for the status.
+    Returns:
+        Template: The serialized card with placeholders for the dynamic leaves.
+    """
+    return Template(
+        _CARD_SKELETON.safe_substitute(
+            title=_json_escape(title), color=json.dumps(color)
+        )
+    )
 
-def task_failure_alert(connection_id: str, redis_conn_id: str = None, delay: dt_time = None):
+
+_SUCCESS_CARD_TEMPLATE = _make_card_template(
+    "✅ Task completed successfully!", STATUS_COLORS["success"]
+)
+_FAILURE_CARD_TEMPLATE = _make_card_template(
+    "❌ Task failed!", STATUS_COLORS["failure"]
+)
+
+
+@functools.lru_cache(maxsize=16)
+def _get_webhook_base(connection_id: str) -> str:
     """
-    Sends a task failure alert to Google Chat.
+    Returns the webhook base URL stored in the connection's password field.
+    Cached per connection ID so each alert does not repeat the Airflow
+    metadata DB round-trip; a process restart invalidates the cache.
     Args:
         connection_id (str): The connection ID.
+    Returns:
+        str: The webhook base URL.
+    """
+    return BaseHook.get_connection(connection_id).password
+
+
+def _construct_webhook_url(connection_id: str, run_id: str = ""):
+    """
+    Constructs the webhook URL for the specified connection ID.
+    Args:
+        connection_id (str): The connection ID.
+        run_id (str): The optional thread reference.
+    Returns:
+        str: The constructed URL.
+    """
+    base = _get_webhook_base(connection_id)
+    # Reference for Google Chat API:
+    # https://developers.google.com/workspace/chat/api/reference/rest/v1/spaces.messages/create
+    # MessageReplyOption details:
+    # https://developers.google.com/workspace/chat/api/reference/rest/v1/spaces.messages/create#MessageReplyOption
+    sep = "&" if "?" in base else "?"
+    return (
+        f"{base}{sep}thread_key={quote(run_id)}"
+        "&messageReplyOption=REPLY_MESSAGE_FALLBACK_TO_NEW_THREAD"
+    )
+
+
+def _send_message(dag_id, run_id, connection_id, message_body):
+    run_id = _build_task_run_id(dag_id, run_id)
+    # Google Chat webhooks are always https already; only normalize stragglers.
+    raw_url = _construct_webhook_url(connection_id, run_id)
+    full_url = raw_url if raw_url.startswith("https://") else _ensure_https(raw_url)
+    if not _validate_url(full_url):
+        print(f"Invalid URL: {full_url}")
+        return
+    print("Sending message to Google Chat")
+    return _send_post_request(message_body, full_url)
+
+
+# Runs the range lookup and removal server-side in one round-trip, so
+# concurrent consumers cannot pop the same alert twice.
+_FLUSH_DUE_ALERTS_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+if #due > 0 then
+    redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1])
+end
+return due
+"""
+
+
+def _flush_due_alerts(redis_conn, now: float = None):
+    """
+    Atomically pops and returns all scheduled alerts due at or before `now`.
+    Args:
+        redis_conn (redis.Redis): The Redis client holding the schedule.
+        now (float): The cutoff timestamp. Defaults to the current time.
+    Returns:
+        list: The serialized alert payloads that were due.
+    """
+    if now is None:
+        now = time.time()
+    return redis_conn.eval(_FLUSH_DUE_ALERTS_LUA, 1, "scheduled_alerts", now)
+
+
+class _BasicAlert:
+    """
+    Callable alert with its parameters bound as instance state.
+    A single slotted instance replaces the nested closures that were
+    previously rebuilt (and re-wrapped) on every callback invocation.
+    """
+
+    __slots__ = ("connection_id", "message_body", "redis_conn_id", "delay")
+
+    def __init__(
+        self,
+        connection_id: str,
+        message_body: dict | str = None,
+        redis_conn_id: str = None,
+        delay: dt_time = None,
+    ):
+        self.connection_id = connection_id
+        self.message_body = message_body
+        self.redis_conn_id = redis_conn_id
+        self.delay = delay
+
+    def __call__(self, context):
+        return self._dispatch(context, self.message_body)
+
+    def _dispatch(self, context, message_body):
+        dag_id, run_id = _get_dag_run_identifiers(context)
+        if self.delay and self.redis_conn_id:
+            redis_conn = _get_redis_client(self.redis_conn_id)
+            now = datetime.now()
+            target = now.replace(
+                hour=self.delay.hour,
+                minute=self.delay.minute,
+                second=self.delay.second,
+                microsecond=0,
+            )
+            if target <= now:
+                target += timedelta(days=1)
+            # Prepare alert data
+            alert_data = {
+                "dag_id": dag_id,
+                "run_id": run_id,
+                "connection_id": self.connection_id,
+                "message_body": message_body,
+            }
+            # Store in Redis sorted set with target timestamp as score
+            redis_conn.zadd(
+                "scheduled_alerts", {_dumps(alert_data): target.timestamp()}
+            )
+            print(f"Alert scheduled for {target.strftime('%Y-%m-%d %H:%M:%S')}")
+        else:
+            return _send_message(dag_id, run_id, self.connection_id, message_body)
+
+
+def _build_task_card(template: Template, task_instance, task_log_url: str) -> str:
     """
+    Fills a serialized card template with a task instance's details.
+    Args:
+        template (Template): The card template for the status.
+        task_instance (TaskInstance): The task instance.
+        task_log_url (str): The task log URL.
+    Returns:
+        str: The JSON message body.
+    """
+    return template.substitute(
+        task_name=_json_escape(task_instance.task.task_display_name),
+        doc_md=_json_escape(task_instance.task.doc_md),
+        dag_id=_json_escape(task_instance.dag_id),
+        hostname=_json_escape(task_instance.hostname),
+        exec_date=task_instance.start_date.replace(tzinfo=None).isoformat(
+            sep=" ", timespec="seconds"
+        ),
+        try_n=task_instance.try_number,
+        max_tries=task_instance.max_tries + 1,
+        log_url=_json_escape(task_log_url),
+    )
+
 
-    def task_failure_alert_inner(context):
+class _TaskAlert(_BasicAlert):
+    """Callable that builds and sends the card set by `_template`."""
+
+    __slots__ = ()
+    _template: Template
+
+    def __call__(self, context):
         task_instance = context.get("task_instance")
         task_log_url = _build_task_log_url(task_instance)
-        # For more details on the message format, refer to the Google Chat API documentation:
-        # https://developers.google.com/chat/api/guides/message-formats/cards
-        # https://developers.google.com/workspace/chat/api/reference/rest/v1/cards
-        message_body = {
-            "cardsV2": [
-                {
-                    "cardId": "airflow-task-success",
-                    "card": {
-                        "header": {
-                            "title": "❌ Task failed!",
-                        },
-                        "sections": [
-                            {
-                                "widgets": [
-                                    {
-                                        "decoratedText": {
-                                            "topLabel": "Task Name",
-                                            "text": f"<b>{task_instance.task.task_display_name}</b>",
-                                        }
-                                    },
-                                    {
-                                        "decoratedText": {
-                                            "topLabel": "Task Description",
-                                            "text": task_instance.task.doc_md,
-                                            "wrapText": True,
-                                        }
-                                    },
-                                    {
-                                        "decoratedText": {
-                                            "topLabel": "DAG ID",
-                                            "text": str(task_instance.dag_id),
-                                        }
-                                    },
-                                    {
-                                        "decoratedText": {
-                                            "topLabel": "Hostname",
-                                            "text": str(task_instance.hostname),
-                                        }
-                                    },
-                                    {
-                                        "decoratedText": {
-                                            "topLabel": "Execution Date",
-                                            "text": task_instance.start_date.strftime(
-                                                "%Y-%m-%d %H:%M:%S"
-                                            ),
-                                        }
-                                    },
-                                    {
-                                        "decoratedText": {
-                                            "topLabel": "Execution number / Max executions",
-                                            "text": f"{task_instance.try_number} / {task_instance.max_tries + 1}",
-                                        }
-                                    },
-                                    {
-                                        "buttonList": {
-                                            "buttons": [
-                                                {
-                                                    "text": "<b>View Logs</b>",
-                                                    "color": STATUS_COLORS.failure.value,
-                                                    "onClick": {
-                                                        "openLink": {
-                                                            "url": task_log_url
-                                                        }
-                                                    },
-                                                }
-                                            ]
-                                        }
-                                    },
-                                ]
-                            }
-                        ],
-                    },
-                }
-            ]
-        }
-        return basic_alert(
-            connection_id=connection_id,
-            message_body=message_body,
-            redis_conn_id=redis_conn_id,
-            delay=delay
-        )(context)
-
-    return task_failure_alert_inner
+        message_body = _build_task_card(self._template, task_instance, task_log_url)
+        return self._dispatch(context, message_body)
+
+
+class _TaskSuccessAlert(_TaskAlert):
+    """Callable that builds and sends the task success card."""
+
+    __slots__ = ()
+    _template = _SUCCESS_CARD_TEMPLATE
+
+
+class _TaskFailureAlert(_TaskAlert):
+    """Callable that builds and sends the task failure card."""
+
+    __slots__ = ()
+    _template = _FAILURE_CARD_TEMPLATE
+
+
+def basic_alert(
+    connection_id: str, message_body: dict | str, redis_conn_id: str = None, delay: dt_time = None
+):
+    """
+    Sends a basic alert to Google Chat.
+    Useful to send small informative messages in working hours to stakeholders.
+    Args:
+        connection_id (str): The connection ID.
+        message_body (dict | str): The message body. Strings are assumed to be
+            pre-serialized JSON.
+        redis_conn_id (str): The Redis connection ID. If None, the alert is sent immediately.
+        delay (dt_time): The time to delay the alert. If None, the alert is sent immediately.
+    """
+    return _BasicAlert(connection_id, message_body, redis_conn_id, delay)
+
+
+def task_success_alert(connection_id: str, redis_conn_id: str = None, delay: dt_time = None):
+    """
+    Sends a task success alert to Google Chat.
+    Args:
+        connection_id (str): The connection ID.
+    """
+    return _TaskSuccessAlert(connection_id, redis_conn_id=redis_conn_id, delay=delay)
+
+
+def task_failure_alert(connection_id: str, redis_conn_id: str = None, delay: dt_time = None):
+    """
+    Sends a task failure alert to Google Chat.
+    Args:
+        connection_id (str): The connection ID.
+    """
+    return _TaskFailureAlert(connection_id, redis_conn_id=redis_conn_id, delay=delay)
@@ -1,10 +1,52 @@
+import functools
 import os
-from urllib.parse import urlparse
+import re
 
-import redis
-import requests
 from airflow.hooks.base import BaseHook
 
+# Matches "http(s)://<netloc>" without the cost of a full urlparse.
+_URL_RE = re.compile(r"\Ahttps?://[^/?\s#]+").match
+
+# Maps characters that are unsafe in thread keys to "-" in a single pass.
+_RUN_ID_TRANS = str.maketrans("+:", "--")
+
+# (connect, read) timeout so a stuck webhook cannot hold an Airflow worker
+# slot indefinitely.
+_REQUEST_TIMEOUT = (3.05, 10)
+
+_SESSION = None
+
+
+def _get_session():
+    """
+    Returns the shared webhook session, creating it on first use.
+    The session reuses TCP connections and TLS handshakes across alerts, and
+    requests is imported lazily so DAG files that never fire an alert do not
+    pay for its import graph on every scheduler parse.
+    Returns:
+        requests.Session: The shared session.
+    """
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter, Retry
+
+        # allowed_methods=False retries POST too; webhook alerts are safe to
+        # resend on transient 5xx responses.
+        retries = Retry(
+            total=2,
+            backoff_factor=0.3,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=False,
+        )
+        _SESSION = requests.Session()
+        _SESSION.mount(
+            "https://",
+            HTTPAdapter(pool_connections=2, pool_maxsize=8, max_retries=retries),
+        )
+        _SESSION.headers.update({"Content-type": "application/json"})
+    return _SESSION
+
 
 def _ensure_https(full_url: str) -> str:
     """
@@ -14,10 +56,11 @@ def _ensure_https(full_url: str) -> str:
     Returns:
         str: The URL with HTTPS scheme if it was not already.
     """
-    parsed_url = urlparse(full_url)
-    if parsed_url.scheme != "https":
-        full_url = parsed_url._replace(scheme="https").geturl()
-    return full_url
+    if full_url.startswith("https://"):
+        return full_url
+    if full_url.startswith("http://"):
+        return "https://" + full_url[7:]
+    return "https://" + full_url
 
 
 def _validate_url(full_url: str) -> bool:
@@ -28,27 +71,33 @@ def _validate_url(full_url: str) -> bool:
     Returns:
         bool: True if the URL is valid, False otherwise.
     """
-    try:
-        result = urlparse(full_url)
-        return all([result.scheme, result.netloc])
-    except AttributeError:
-        return False
+    return _URL_RE(full_url) is not None
 
 
 def _send_post_request(message_body, full_url):
     """
     Sends a POST request to the specified URL with the given message body.
     Args:
-        message_body (dict): The message body to send.
+        message_body (dict | str): The message body to send. Strings are
+            assumed to be pre-serialized JSON and sent as-is.
         full_url (str): The URL to send the request to.
     Returns:
-        int: The HTTP status code of the response.
+        int: The HTTP status code of the response, or 0 when the request
+            timed out or could not connect. Alert callbacks must never
+            take down the task they report on.
     """
-    r = requests.post(
-        url=full_url,
-        json=message_body,
-        headers={"Content-type": "application/json"},
-    )
+    import requests
+
+    if isinstance(message_body, (str, bytes)):
+        body_kwargs = {"data": message_body}
+    else:
+        body_kwargs = {"json": message_body}
+    try:
+        r = _get_session().post(url=full_url, timeout=_REQUEST_TIMEOUT, **body_kwargs)
+    except requests.exceptions.RequestException as e:
+        print(f"Error: {e}")
+        print("Failed to send message.")
+        return 0
     if r.status_code != 200:
         print(f"Error: {r.status_code} - {r.text}")
         print("Failed to send message.")
@@ -57,6 +106,23 @@ def _send_post_request(message_body, full_url):
     return r.status_code
 
 
+def _resolve_base_url() -> str:
+    """
+    Resolves the Airflow base URL from the environment.
+    Returns:
+        str: The base URL, upgraded to HTTPS unless it points to a local instance.
+    """
+    base_url = os.environ.get("AIRFLOW__API__BASE_URL", "http://localhost:8080")
+    if "local" not in base_url:
+        base_url = _ensure_https(base_url)
+    return base_url
+
+
+# Resolved once at import: the environment does not change for the lifetime
+# of a worker process. Tests can override by patching this constant.
+_AIRFLOW_BASE_URL = _resolve_base_url()
+
+
 def _build_task_log_url(task_instance) -> str:
     """
     Constructs the task log URL for the given task instance.
@@ -65,21 +131,23 @@ def _build_task_log_url(task_instance) -> str:
     Returns:
         str: The constructed task log URL.
     """
-    base_url = os.environ.get("AIRFLOW__API__BASE_URL", "http://localhost:8080")
-    if "local" not in base_url:
-        base_url = _ensure_https(base_url)
-    task_url = f"{base_url}/dags/{task_instance.dag_id}/runs/{task_instance.run_id}/tasks/{task_instance.task_id}"
-    return task_url
+    return f"{_AIRFLOW_BASE_URL}/dags/{task_instance.dag_id}/runs/{task_instance.run_id}/tasks/{task_instance.task_id}"
 
 
+@functools.lru_cache(maxsize=8)
 def _get_redis_client(connection_id="redis_default"):
     """
     Returns a Redis client using Airflow connection.
+    Cached per connection ID: workers are long-lived, so reusing the client
+    (and its internal connection pool) avoids an Airflow metadata DB lookup
+    and a fresh socket per alert. A process restart invalidates the cache.
     Args:
         connection_id (str): The Airflow connection ID for Redis.
     Returns:
         redis.Redis: Redis client instance.
     """
+    import redis
+
     conn = BaseHook.get_connection(connection_id)
     return redis.Redis(
         host=conn.host,
@@ -97,9 +165,7 @@ def _build_task_run_id(dag_id, run_id) -> str:
     Returns:
         str: The constructed task run ID.
     """
-    dag_id = str(dag_id)
-    run_id = str(run_id).replace("+", "-").replace(":", "-")
-    return f"{dag_id}-{run_id}"
+    return f"{dag_id}-{str(run_id).translate(_RUN_ID_TRANS)}"
 
 
 def _get_dag_run_identifiers(context) -> tuple:
@@ -1,13 +1,21 @@
 import os
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+import pytest
 from airflow.decorators import task
-from airflow_alerts.google_chat import _construct_webhook_url
+from airflow_alerts.google_chat import _construct_webhook_url, _get_webhook_base
 
 from airflow import DAG
 
 
+@pytest.fixture(autouse=True)
+def clear_webhook_cache():
+    """Drops cached webhook URLs so each test sees its own mocked connection."""
+    _get_webhook_base.cache_clear()
+
+
 @task
 def simple_task():
     """
@@ -24,8 +32,7 @@ def task_that_fails():
 
 
 def test_construct_webhook_url():
-    mock_conn = MagicMock()
-    mock_conn.password = "https://gchat.example/webhook"
+    mock_conn = SimpleNamespace(password="https://gchat.example/webhook")
     with patch(
         "airflow_alerts.google_chat.BaseHook.get_connection", return_value=mock_conn
     ):
@@ -56,8 +63,7 @@ def test__build_task_run_id():
 def test_basic_alert():
     from airflow_alerts.google_chat import basic_alert
 
-    mock_conn = MagicMock()
-    mock_conn.password = os.getenv("GOOGLE_CHAT_WEBHOOK_URL")
+    mock_conn = SimpleNamespace(password=os.getenv("GOOGLE_CHAT_WEBHOOK_URL"))
 
     with patch(
         "airflow_alerts.google_chat.BaseHook.get_connection", return_value=mock_conn
@@ -76,18 +82,18 @@ def test_basic_alert():
 def test_task_success_alert():
     from airflow_alerts.google_chat import task_success_alert
 
-    mock_conn = MagicMock()
-    mock_conn.password = os.getenv("GOOGLE_CHAT_WEBHOOK_URL")
+    mock_conn = SimpleNamespace(password=os.getenv("GOOGLE_CHAT_WEBHOOK_URL"))
     mock_task = simple_task()
     mock_task.task_display_name = "Test Task"
     mock_task.doc_md = "Task description"
-    mock_task_instance = MagicMock()
-    mock_task_instance.task = mock_task
-    mock_task_instance.dag_id = "my_dag"
-    mock_task_instance.hostname = "test-host"
-    mock_task_instance.start_date = datetime(2024, 5, 26, 12, 0, 0)
-    mock_task_instance.try_number = 1
-    mock_task_instance.max_tries = 2
+    mock_task_instance = SimpleNamespace(
+        task=mock_task,
+        dag_id="my_dag",
+        hostname="test-host",
+        start_date=datetime(2024, 5, 26, 12, 0, 0),
+        try_number=1,
+        max_tries=2,
+    )
     context = {
         "task_instance": mock_task_instance,
         "dag": DAG(
@@ -115,18 +121,18 @@ def test_task_success_alert():
 def test_task_failure_alert():
     from airflow_alerts.google_chat import task_failure_alert
 
-    mock_conn = MagicMock()
-    mock_conn.password = os.getenv("GOOGLE_CHAT_WEBHOOK_URL")
+    mock_conn = SimpleNamespace(password=os.getenv("GOOGLE_CHAT_WEBHOOK_URL"))
     mock_task = task_that_fails()
     mock_task.task_display_name = "Test Task"
     mock_task.doc_md = "Task description"
-    mock_task_instance = MagicMock()
-    mock_task_instance.task = mock_task
-    mock_task_instance.dag_id = "my_dag"
-    mock_task_instance.hostname = "test-host"
-    mock_task_instance.start_date = datetime(2024, 5, 26, 12, 0, 0)
-    mock_task_instance.try_number = 1
-    mock_task_instance.max_tries = 2
+    mock_task_instance = SimpleNamespace(
+        task=mock_task,
+        dag_id="my_dag",
+        hostname="test-host",
+        start_date=datetime(2024, 5, 26, 12, 0, 0),
+        try_number=1,
+        max_tries=2,
+    )
     context = {
         "task_instance": mock_task_instance,
         "dag": DAG(
@@ -149,3 +155,17 @@ def test_task_failure_alert():
         result = alert_fn(context=context)
 
         assert result == 200
+
+
+def test__flush_due_alerts():
+    from airflow_alerts.google_chat import _FLUSH_DUE_ALERTS_LUA, _flush_due_alerts
+
+    mock_redis = MagicMock()
+    mock_redis.eval.return_value = [b'{"dag_id": "my_dag"}']
+
+    result = _flush_due_alerts(mock_redis, now=1234.5)
+
+    mock_redis.eval.assert_called_once_with(
+        _FLUSH_DUE_ALERTS_LUA, 1, "scheduled_alerts", 1234.5
+    )
+    assert result == [b'{"dag_id": "my_dag"}']